@@ -20,7 +20,7 @@ from twisted.internet.defer import succeed, inlineCallbacks, returnValue
 from twisted.web import server
 from twisted.web.test.test_web import DummyRequest
 
-from txoauth2 import GrantTypes
+from txoauth2 import GRANT_TYPES_TUPLE
 from txoauth2.token import TokenFactory, UserPasswordManager, PersistentStorage
 from txoauth2.clients import ClientStorage, PasswordClient
 
@@ -87,9 +87,8 @@ class MockRequest(DummyRequest):
         """
         self.user = ensureByteString(username)
         self.password = ensureByteString(password)
-        # pylint: disable=deprecated-method
-        self.setRequestHeader(b'Authorization', authType.encode('utf-8') + b' ' +
-                              _encodeBase64(self.user + b':' + self.password))
+        self.setRequestHeader(
+            b'Authorization', encodeAuthorizationHeader(self.user, self.password, authType))
 
     def getUser(self):
         """
@@ -234,6 +233,8 @@ class TestTokenFactory(TokenFactory):
 
     def assertAllTokensRequested(self):
         """ Assert that all expected tokens have been requested from the token factory. """
+        if not self._tokens and not self._requestedTokens:
+            return
         self._testCase.assertListEqual(
             self._tokens, [],
             msg='Not all expected tokens have been requested from the token factory: '
@@ -241,7 +242,7 @@ class TestTokenFactory(TokenFactory):
         self._testCase.assertListEqual(
             self._requestedTokens, [],
             msg='More tokens have been requested from the token factory than expected: '
-                '{tokens}'.format(tokens=', '.join(data[0] for data in self._tokens)))
+                '{tokens}'.format(tokens=', '.join(data[0] for data in self._requestedTokens)))
 
     def reset(self, testCase):
         """
@@ -349,8 +350,7 @@ def getTestPasswordClient(clientId=None, authorizedGrantTypes=None):
     if clientId is None:
         clientId = str(uuid4())
     if authorizedGrantTypes is None:
-        # noinspection PyTypeChecker
-        authorizedGrantTypes = list(GrantTypes)
+        authorizedGrantTypes = list(GRANT_TYPES_TUPLE)
     return PasswordClient(
         clientId, ['https://return.nonexistent'], authorizedGrantTypes, secret='ClientSecret')
 
@@ -373,6 +373,28 @@ def assertClientEquals(testCase, client, expectedClient, message):
             msg=message + ': Attribute "{name}" differs from expected value'.format(name=name))
 
 
+_AUTHORIZATION_HEADERS = {}
+
+
+def encodeAuthorizationHeader(username, password, authType='Basic'):
+    """
+    The encoded headers are cached, because the tests authenticate
+    with the same few credentials over and over again.
+    :param username: The username.
+    :param password: The password.
+    :param authType: The type of authorization.
+    :return: The value of an Authorization header with the given credentials.
+    """
+    key = (username, password, authType)
+    header = _AUTHORIZATION_HEADERS.get(key)
+    if header is None:
+        # pylint: disable=deprecated-method
+        header = authType.encode('utf-8') + b' ' + _encodeBase64(
+            ensureByteString(username) + b':' + ensureByteString(password))
+        _AUTHORIZATION_HEADERS[key] = header
+    return header
+
+
 def ensureByteString(string):
     """
     :param string: A string.
@@ -1,14 +1,39 @@
 """ Test for the Client class. """
 
 from tests import TwistedTestCase
-from txoauth2 import GrantTypes
+from txoauth2 import GrantTypes, GRANT_TYPES_TUPLE
 from txoauth2.util import isAnyStr
 from txoauth2.clients import Client, PasswordClient
 
+# Only Python 2 treats byte strings as str, so on Python 3 they are a type the Client must reject.
+_BYTES_ARE_STR = isinstance(b'', str)
+_NOT_STRING_URI = u'https://valid.nonexistent' if _BYTES_ARE_STR else b'https://valid.nonexistent'
+_NOT_STRING_GRANT_TYPE = u'Test' if _BYTES_ARE_STR else b'Test'
+_INVALID_CLIENT_IDS = (1, None, True, [], {}, object()) + (() if _BYTES_ARE_STR else (b'clientId',))
+_INVALID_REDIRECT_URIS = (
+    'x', 1, None, True, object(), [_NOT_STRING_URI], [None], [True], [object()],
+    [_NOT_STRING_URI, 'https://valid.nonexistent'], [None, 'https://valid.nonexistent'],
+    [True, 'https://valid.nonexistent'], [object(), 'https://valid.nonexistent'])
+_INVALID_GRANT_TYPES = (
+    'x', 1, None, True, object(), [_NOT_STRING_GRANT_TYPE], [None], [True], [object()],
+    [_NOT_STRING_GRANT_TYPE, GrantTypes.AUTHORIZATION_CODE], [None, GrantTypes.AUTHORIZATION_CODE],
+    [True, GrantTypes.AUTHORIZATION_CODE], [object(), GrantTypes.AUTHORIZATION_CODE])
+
 
 class ClientTest(TwistedTestCase):
     """ Tests the functionality of the Client object. """
 
+    def _expectValueError(self, *args):
+        """
+        Assert that creating a Client with the given arguments raises a ValueError.
+        :param args: The arguments to the Client constructor.
+        """
+        try:
+            Client(*args)
+        except ValueError:
+            return
+        self.fail('Expected Client to raise a ValueError for the arguments ' + repr(args))
+
     def testClientAttributeTypes(self):
         """ Ensure that all attributes of the client are of the expected type. """
         client = PasswordClient('clientId', ['https://valid.nonexistent'], ['password'], 'secret')
@@ -56,13 +81,11 @@ class ClientTest(TwistedTestCase):
         """ Test that the client only accepts client ids that are a string. """
         for clientId in ['clientId', u'clientId']:
             try:
-                Client('clientId', [], [])
+                Client(clientId, [], [])
             except ValueError:
                 self.fail('Expected Client to accept a client id of type ' + str(type(clientId)))
-        for clientId in [1, None, True, [], {}, object()]:
-            self.assertRaises(ValueError, Client, clientId, [], [])
-        if not isinstance(b'', str):
-            self.assertRaises(ValueError, Client, b'clientId', [], [])
+        for clientId in _INVALID_CLIENT_IDS:
+            self._expectValueError(clientId, [], [])
 
     def testValidatesUris(self):
         """ Test that the client only accepts list of strings as uris. """
@@ -73,16 +96,12 @@ class ClientTest(TwistedTestCase):
                 Client('clientId', urls, [])
             except ValueError:
                 self.fail('Expected Client to accept these urls: ' + str(urls))
-        notString = b'https://valid.nonexistent' if isinstance(u'', str) \
-            else u'https://valid.nonexistent'
-        for urls in ['x', 1, None, True, object(), [notString], [None], [True], [object()],
-                     [notString, 'https://valid.nonexistent'], [None, 'https://valid.nonexistent'],
-                     [True, 'https://valid.nonexistent'], [object(), 'https://valid.nonexistent']]:
-            self.assertRaises(ValueError, Client, 'clientId', urls, [])
+        for urls in _INVALID_REDIRECT_URIS:
+            self._expectValueError('clientId', urls, [])
 
     def testValidatesGrantTypes(self):
         """ Test that the client only accepts list of strings as grant types. """
-        for grantType in GrantTypes:
+        for grantType in GRANT_TYPES_TUPLE:
             try:
                 Client('clientId', [], [grantType.value])
                 Client('clientId', [], [GrantTypes.AUTHORIZATION_CODE.value, grantType.value])
@@ -93,10 +112,5 @@ class ClientTest(TwistedTestCase):
                 Client('clientId', [], [GrantTypes.AUTHORIZATION_CODE, grantType])
             except ValueError as error:
                 self.fail('Expected Client to accept a GrantType object: ' + str(error))
-        notString = b'Test' if isinstance(u'', str) else u'Test'
-        for grantTypes in ['x', 1, None, True, object(), [notString], [None], [True], [object()],
-                           [notString, GrantTypes.AUTHORIZATION_CODE],
-                           [None, GrantTypes.AUTHORIZATION_CODE],
-                           [True, GrantTypes.AUTHORIZATION_CODE],
-                           [object(), GrantTypes.AUTHORIZATION_CODE]]:
-            self.assertRaises(ValueError, Client, 'clientId', [], grantTypes)
+        for grantTypes in _INVALID_GRANT_TYPES:
+            self._expectValueError('clientId', [], grantTypes)
@@ -3,11 +3,18 @@
 import os
 import shutil
 
-from tempfile import NamedTemporaryFile, mkdtemp
+from tempfile import mkdtemp
+try:
+    from ConfigParser import NoOptionError
+    from StringIO import StringIO
+except ImportError:
+    # noinspection PyUnresolvedReferences
+    from configparser import NoOptionError
+    from io import StringIO
 
 from txoauth2 import GrantTypes
 from txoauth2.clients import Client, PublicClient, PasswordClient
-from txoauth2.imp import ConfigParserClientStorage
+from txoauth2.imp import ConfigParserClientStorage, SQLiteClientStorage
 
 from tests import TwistedTestCase, getTestPasswordClient, assertClientEquals
 
@@ -76,10 +83,8 @@ class ConfigParserClientStorageTest(Abstract.ClientStorageTest):
 
     @classmethod
     def setUpClass(cls):
-        with NamedTemporaryFile(prefix='.ini', delete=False) as tempFile:
-            cls.clientStoragePath = tempFile.name
-        clientStorage = ConfigParserClientStorage(cls.clientStoragePath)
-        cls.setupClientStorage(clientStorage)
+        cls.clientStorageFile = StringIO()
+        clientStorage = ConfigParserClientStorage(cls.clientStorageFile)
         for client in cls._VALID_CLIENTS:
             clientStorage.addClient(client)
 
@@ -91,10 +96,7 @@ class ConfigParserClientStorageTest(Abstract.ClientStorageTest):
                     ConfigParserClientStorageTest.NOT_FOUND_CLASS_CLIENT_ID, [], [])
 
         clientStorage.addClient(TestNotFoundClassClient())
-
-    @classmethod
-    def tearDownClass(cls):
-        os.unlink(cls.clientStoragePath)
+        cls.setupClientStorage(clientStorage)
 
     def testAddClient(self):
         """ Test if a client can be added to the client storage. """
@@ -114,11 +116,95 @@ class ConfigParserClientStorageTest(Abstract.ClientStorageTest):
             client.secret, self._CLIENT_STORAGE.getClient(client.id).secret,
             msg='Expected the client storage to contain a client after adding him.')
 
+    def testUpdateClient(self):
+        """ Test that re-adding a changed client updates the stored client. """
+        client = PasswordClient('updatedPasswordClientId', ['https://return.nonexistent'],
+                                ['client_credentials'], 'oldClientSecret')
+        self._CLIENT_STORAGE.addClient(client)
+        self._CLIENT_STORAGE.addClient(client)
+        client.secret = 'newClientSecret'
+        self._CLIENT_STORAGE.addClient(client)
+        self.assertEqual(
+            client.secret,
+            ConfigParserClientStorage(StringIO(self.clientStorageFile.getvalue()))
+            .getClient(client.id).secret,
+            msg='Expected the client storage to save the changes of a client after adding him.')
+
+    def testAddUnchangedClient(self):
+        """ Test that re-adding an unchanged client doesn't rewrite the config file. """
+        configFile = StringIO()
+        clientStorage = ConfigParserClientStorage(configFile)
+        client = PasswordClient('unchangedClientId', ['https://return.nonexistent'],
+                                ['client_credentials'], 'clientSecret')
+        clientStorage.addClient(client)
+        configFile.seek(0)
+        configFile.truncate()
+        clientStorage.addClient(client)
+        self.assertEqual('', configFile.getvalue(),
+                         msg='Expected the client storage to not rewrite the config file '
+                             'when adding a client that is already stored unchanged.')
+
+    def testRetryFailedWrite(self):
+        """ Test that re-adding a client retries a write of the client that failed. """
+        tempDir = mkdtemp()
+        try:
+            path = os.path.join(tempDir, 'clients.ini')
+            os.mkdir(path)
+            clientStorage = ConfigParserClientStorage(path)
+            self.assertRaises((IOError, OSError), clientStorage.addClient, self._VALID_CLIENTS[0])
+            os.rmdir(path)
+            clientStorage.addClient(self._VALID_CLIENTS[0])
+            assertClientEquals(
+                self, ConfigParserClientStorage(path).getClient(self._VALID_CLIENTS[0].id),
+                self._VALID_CLIENTS[0], message='Expected the client storage to write the client '
+                                                'when adding it again after a failed write.')
+        finally:
+            shutil.rmtree(tempDir, ignore_errors=True)
+
+    def testGetClientAfterUpdate(self):
+        """ Test that getClient returns the updated client after the client was added again. """
+        client = PasswordClient('cachedPasswordClientId', ['https://return.nonexistent'],
+                                ['client_credentials'], 'oldClientSecret')
+        self._CLIENT_STORAGE.addClient(client)
+        cachedClient = self._CLIENT_STORAGE.getClient(client.id)
+        cachedClient.redirectUris.append('https://changed.nonexistent')
+        assertClientEquals(
+            self, self._CLIENT_STORAGE.getClient(client.id), client,
+            message='Expected the client storage to not return a client that was changed '
+                    'by a previous caller.')
+        client.secret = 'newClientSecret'
+        self._CLIENT_STORAGE.addClient(client)
+        self.assertEqual(client.secret, self._CLIENT_STORAGE.getClient(client.id).secret,
+                         msg='Expected the client storage to return the updated client '
+                             'after adding the changed client.')
+
+    def testSaveWithoutAutoSave(self):
+        """ Test that a client storage without autoSave only writes the clients on save. """
+        configFile = StringIO()
+        clientStorage = ConfigParserClientStorage(configFile, autoSave=False)
+        client = PasswordClient('notAutoSavedClientId', ['https://return.nonexistent'],
+                                ['client_credentials'], 'clientSecret')
+        clientStorage.addClient(client)
+        self.assertEqual('', configFile.getvalue(),
+                         msg='Expected the client storage to not write the added client '
+                             'to the config file if autoSave is disabled.')
+        clientStorage.save()
+        assertClientEquals(
+            self, ConfigParserClientStorage(StringIO(configFile.getvalue())).getClient(client.id),
+            client, message='Expected the client storage to write the added client '
+                            'to the config file on save.')
+
     def testGetUnknownClient(self):
         """ Test handling of requests for clients that do net exist in the client storage. """
         self.assertRaises(
             ValueError, self._CLIENT_STORAGE.getClient, self.NOT_FOUND_CLASS_CLIENT_ID)
 
+    def testGetMalformedClient(self):
+        """ Test that a client with missing options is not reported as an unknown client. """
+        clientStorage = ConfigParserClientStorage(StringIO(
+            '[client_malformedClientId]\ntype = PublicClient\n'))
+        self.assertRaises(NoOptionError, clientStorage.getClient, 'malformedClientId')
+
     def testWritingInNonexistentDirectory(self):
         """ Test that the client storage is able to write to a location that doesn't exist. """
         tempDir = mkdtemp()
@@ -132,3 +218,68 @@ class ConfigParserClientStorageTest(Abstract.ClientStorageTest):
                           'not exist, but got an error: {msg}'.format(msg=error))
         finally:
             shutil.rmtree(tempDir, ignore_errors=True)
+
+
+class SQLiteClientStorageTest(Abstract.ClientStorageTest):
+    """ Test the SQLiteClientStorage. """
+    NOT_FOUND_CLASS_CLIENT_ID = 'notFoundClassClientId'
+
+    @classmethod
+    def setUpClass(cls):
+        clientStorage = SQLiteClientStorage(':memory:')
+        for client in cls._VALID_CLIENTS:
+            clientStorage.addClient(client)
+
+        class TestNotFoundClassSQLiteClient(PublicClient):
+            """ A Client class that will not be found by getClient. """
+
+            def __init__(self):
+                super(TestNotFoundClassSQLiteClient, self).__init__(
+                    SQLiteClientStorageTest.NOT_FOUND_CLASS_CLIENT_ID, [], [])
+
+        clientStorage.addClient(TestNotFoundClassSQLiteClient())
+        cls.setupClientStorage(clientStorage)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._CLIENT_STORAGE.close()
+
+    def testAddClient(self):
+        """ Test if a client can be added to and updated in the client storage. """
+        client = PasswordClient(
+            'newPasswordClientId', ['https://return.nonexistent', 'https://return2.nonexistent'],
+            ['client_credentials'], 'oldClientSecret')
+        self._CLIENT_STORAGE.addClient(client)
+        assertClientEquals(
+            self, self._CLIENT_STORAGE.getClient(client.id), client,
+            message='Expected the client storage to contain a client after adding him.')
+        client.secret = 'newClientSecret'
+        self._CLIENT_STORAGE.addClient(client)
+        self.assertEqual(client.secret, self._CLIENT_STORAGE.getClient(client.id).secret,
+                         msg='Expected the client storage to return the updated client '
+                             'after adding the changed client.')
+
+    def testGetUnknownClient(self):
+        """ Test handling of requests for clients whose class is not known. """
+        self.assertRaises(
+            ValueError, self._CLIENT_STORAGE.getClient, self.NOT_FOUND_CLASS_CLIENT_ID)
+
+    def testPersistence(self):
+        """ Test that the clients are still available after reopening the database. """
+        tempDir = mkdtemp()
+        try:
+            path = os.path.join(tempDir, 'nonexistentDir', 'clients.db')
+            clientStorage = SQLiteClientStorage(path)
+            clientStorage.addClient(self._VALID_CLIENTS[0])
+            clientStorage.close()
+            clientStorage = SQLiteClientStorage(path)
+            try:
+                assertClientEquals(
+                    self, clientStorage.getClient(self._VALID_CLIENTS[0].id),
+                    self._VALID_CLIENTS[0],
+                    message='Expected the client storage to load a client '
+                            'that was stored in the database before.')
+            finally:
+                clientStorage.close()
+        finally:
+            shutil.rmtree(tempDir, ignore_errors=True)
@@ -602,6 +602,22 @@ class Abstract(object):
                     '{type} grant with a subset of the scope original '
                     'requested.'.format(type=self._RESPONSE_TYPE))
 
+        @classmethod
+        def _baseGrantData(cls, responseType, scope=None):
+            """
+            :param responseType: The response type of the authorization request.
+            :param scope: The requested scope or None for the default scope.
+            :return: A new dict with the data of a valid authorization request
+                     of the valid client, as it is stored in the persistent storage.
+            """
+            return {
+                'response_type': responseType,
+                'redirect_uri': cls._VALID_CLIENT.redirectUris[0],
+                'client_id': cls._VALID_CLIENT.id,
+                'scope': ['All'] if scope is None else scope,
+                'state': b'state\xFF\xFF'
+            }
+
         def _testGrantAccessAdditionalData(self, dataKey, responseType, msg):
             """
             Ensure that additional data given to grantAccess is stored with the code.
@@ -610,16 +626,9 @@ class Abstract(object):
             :param responseType: The response type of the authorization request.
             :param msg: The assertion message.
             """
-            redirectUri = self._VALID_CLIENT.redirectUris[0]
             request = MockRequest('GET', 'some/path')
             additionalData = 'someData'
-            data = {
-                'response_type': responseType,
-                'redirect_uri': redirectUri,
-                'client_id': self._VALID_CLIENT.id,
-                'scope': ['All'],
-                'state': b'state\xFF\xFF'
-            }
+            data = self._baseGrantData(responseType)
             self._PERSISTENT_STORAGE.put(dataKey, data)
             result = self._AUTH_RESOURCE.grantAccess(request, dataKey,
                                                      additionalData=additionalData)
@@ -73,16 +73,9 @@ class TestAuthorizationCodeGrant(Abstract.SharedGrantTest):
     def testGrantAccessCodeLifetime(self):
         """ Ensure that the code lifetime is controlled by the codeDataLifetime parameter. """
         dataKey = 'authorizationCodeGrantDataKeyLifetime'
-        redirectUri = self._VALID_CLIENT.redirectUris[0]
         lifeTime = 60
         request = MockRequest('GET', 'some/path')
-        data = {
-            'response_type': GrantTypes.AUTHORIZATION_CODE.value,
-            'redirect_uri': redirectUri,
-            'client_id': self._VALID_CLIENT.id,
-            'scope': ['All'],
-            'state': b'state\xFF\xFF'
-        }
+        data = self._baseGrantData(GrantTypes.AUTHORIZATION_CODE.value)
         self._PERSISTENT_STORAGE.put(dataKey, data)
         result = self._AUTH_RESOURCE.grantAccess(request, dataKey, codeLifeTime=lifeTime)
         self.assertValidCodeResponse(
@@ -35,66 +35,54 @@ class TestImplicitCodeGrant(Abstract.SharedGrantTest):
             msg = msg[:-1]
         redirectParameter = super(TestImplicitCodeGrant, self).assertValidCodeResponse(
             request, result, data, msg, parameterInFragment)
+        msgPrefix = msg + ': '
+        scope = redirectParameter.get('scope')
+        accessToken = redirectParameter.get('access_token')
+        tokenType = redirectParameter.get('token_type')
+        expiresIn = redirectParameter.get('expires_in')
         if expectedScope is None:
             expectedScope = data['scope']
-        self.assertIn(
-            'scope', redirectParameter, msg=msg + ': Expected the authorization resource send the '
-                                                  'scope of the access token to the redirect uri.')
-        self.assertEqual(' '.join(expectedScope), redirectParameter['scope'],
-                         msg=msg + ': Expected the authorization resource to send '
-                                   'the expected scope to the redirect uri.')
-        self.assertNotIn(
-            'refresh_token', redirectParameter,
-            msg=msg + ': Expected the authorization resource to not send a refresh token.')
-        self.assertIn('access_token', redirectParameter,
-                      msg=msg + ': Expected the authorization resource to send '
-                                'an access token to the redirect uri.')
-        self.assertIn('token_type', redirectParameter,
-                      msg=msg + ': Expected the authorization resource to send '
-                                'the token type to the redirect uri.')
-        self.assertEqual('Bearer', redirectParameter['token_type'],
-                         msg=msg + ': Expected the authorization resource to send the '
-                                   'correct token type to the redirect uri.')
-        self.assertIn('expires_in', redirectParameter,
-                      msg=msg + ': Expected the authorization resource to send '
-                                'the token lifetime to the redirect uri.')
         if expectedAccessTokenLifetime is None:
             expectedAccessTokenLifetime = self._AUTH_RESOURCE.authTokenLifeTime
-        self.assertEqual(str(expectedAccessTokenLifetime), redirectParameter['expires_in'],
-                         msg=msg + ': Expected the authorization resource to send the '
-                                   'correct token lifetime to the redirect uri.')
-        accessToken = redirectParameter['access_token']
+        self.assertEqual(' '.join(expectedScope), scope,
+                         msg=msgPrefix + 'Expected the authorization resource to send '
+                                         'the expected scope to the redirect uri.')
+        self.assertNotIn(
+            'refresh_token', redirectParameter,
+            msg=msgPrefix + 'Expected the authorization resource to not send a refresh token.')
+        self.assertIsNotNone(accessToken,
+                             msg=msgPrefix + 'Expected the authorization resource to send '
+                                             'an access token to the redirect uri.')
+        self.assertEqual('Bearer', tokenType,
+                         msg=msgPrefix + 'Expected the authorization resource to send the '
+                                         'correct token type to the redirect uri.')
+        self.assertEqual(str(expectedAccessTokenLifetime), expiresIn,
+                         msg=msgPrefix + 'Expected the authorization resource to send the '
+                                         'correct token lifetime to the redirect uri.')
         self.assertTrue(self._TOKEN_STORAGE.contains(accessToken),
-                        msg=msg + ': Expected the authorization resource to store the '
-                                  'auth token in the token storage.')
+                        msg=msgPrefix + 'Expected the authorization resource to store the '
+                                        'auth token in the token storage.')
         self.assertTrue(self._TOKEN_STORAGE.hasAccess(accessToken, expectedScope),
-                        msg=msg + ': Expected the authorization resource to give the '
-                                  'auth token access to the expected scope.')
+                        msg=msgPrefix + 'Expected the authorization resource to give the '
+                                        'auth token access to the expected scope.')
         self.assertEqual(
             expectedAdditionalData, self._TOKEN_STORAGE.getTokenAdditionalData(accessToken),
-            msg=msg + ': Expected the authorization resource to store '
-                      'the expected additional data with the token.')
+            msg=msgPrefix + 'Expected the authorization resource to store '
+                            'the expected additional data with the token.')
         expectedToken = self._TOKEN_FACTORY.expectedTokenRequest(
             expectedAccessTokenLifetime, self._VALID_CLIENT, expectedScope, expectedAdditionalData)
         self._TOKEN_FACTORY.assertAllTokensRequested()
-        self.assertEqual(
-            expectedToken, accessToken, msg=msg + ': Expected the authorization resource to return '
-                                                  'the expected token to the redirect uri.')
+        self.assertEqual(expectedToken, accessToken,
+                         msg=msgPrefix + 'Expected the authorization resource to return '
+                                         'the expected token to the redirect uri.')
 
     def testAccessTokenLifetime(self):
         """ Ensure that the token lifetime is controlled by the authTokenLifeTime parameter. """
         dataKey = 'implicitGrantDataKeySubsetLifetime'
-        redirectUri = self._VALID_CLIENT.redirectUris[0]
         request = MockRequest('GET', 'some/path')
         lifetime = 10
         scope = ['All']
-        data = {
-            'response_type': GrantTypes.IMPLICIT.value,
-            'redirect_uri': redirectUri,
-            'client_id': self._VALID_CLIENT.id,
-            'scope': scope,
-            'state': b'state\xFF\xFF'
-        }
+        data = self._baseGrantData(GrantTypes.IMPLICIT.value, scope)
         self._PERSISTENT_STORAGE.put(dataKey, data)
         authResource = self.TestOAuth2Resource(
             self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._CLIENT_STORAGE,
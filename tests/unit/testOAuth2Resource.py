@@ -10,7 +10,7 @@ except ImportError:
     from urllib.parse import urlparse, parse_qs
 
 from twisted.web.server import NOT_DONE_YET
-from txoauth2 import GrantTypes
+from txoauth2 import GrantTypes, GRANT_TYPES_TUPLE
 from txoauth2.clients import PasswordClient
 from txoauth2.errors import MissingParameterError, UnauthorizedClientError, \
     UnsupportedResponseTypeError, MalformedParameterError, MultipleParameterError, \
@@ -32,7 +32,7 @@ class Abstract(object):
         _VALID_CLIENT = PasswordClient('authResourceClientId',
                                        ['https://return.nonexistent?param=retain',
                                         'http://return.nonexistent/notSecure?param=retain'],
-                                       list(GrantTypes), secret='ClientSecret')
+                                       list(GRANT_TYPES_TUPLE), secret='ClientSecret')
         _RESPONSE_GRANT_TYPE_MAPPING = {
             'code': GrantTypes.AUTHORIZATION_CODE.value,
             'token': GrantTypes.IMPLICIT.value
@@ -1,7 +1,6 @@
 """ Tests for the client credentials grant flow. """
 
 from txoauth2.clients import PublicClient
-from txoauth2.token import TokenResource
 from txoauth2.errors import UnauthorizedClientError, MissingParameterError, \
     MultipleParameterError, InvalidScopeError
 
@@ -55,10 +54,7 @@ class TestClientCredentialsGrant(Abstract.TokenResourceTest):
         """
         defaultScope = ['default', 'scope']
         accessToken = 'clientCredentialsAccessTokenWithoutScope'
-        tokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, defaultScope=defaultScope,
-            passwordManager=self._PASSWORD_MANAGER)
+        tokenResource = self._getTokenResource(defaultScope=defaultScope)
         request = self.generateValidTokenRequest(arguments={
             'grant_type': 'client_credentials',
         }, authentication=self._VALID_CLIENT)
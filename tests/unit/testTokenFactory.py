@@ -1,7 +1,7 @@
 """ Test a token factory. """
 
 from txoauth2.token import TokenResource
-from txoauth2.imp import UUIDTokenFactory
+from txoauth2.imp import UUIDTokenFactory, RandomTokenFactory
 
 from tests import TwistedTestCase, getTestPasswordClient
 
@@ -46,12 +46,8 @@ class Abstract(object):
                 self._TOKEN_FACTORY.generateToken(200, self._DUMMY_CLIENT, self._VALID_SCOPE),
                 self._TOKEN_FACTORY.generateToken(200, self._DUMMY_CLIENT, self._VALID_SCOPE),
             ]
-            for firstToken in tokens:
-                for secondToken in tokens:
-                    if firstToken is secondToken:
-                        continue
-                    self.assertNotEqual(firstToken, secondToken,
-                                        msg='Expected the token factory to generate unique tokens.')
+            self.assertEqual(len(tokens), len(set(tokens)),
+                             msg='Expected the token factory to generate unique tokens.')
 
 
 class UUIDTokenFactoryTest(Abstract.TokenFactoryTest):
@@ -60,3 +56,11 @@ class UUIDTokenFactoryTest(Abstract.TokenFactoryTest):
     @classmethod
     def setUpClass(cls):
         cls.setupTokenFactory(UUIDTokenFactory())
+
+
+class RandomTokenFactoryTest(Abstract.TokenFactoryTest):
+    """ Test the RandomTokenFactory. """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.setupTokenFactory(RandomTokenFactory())
@@ -3,7 +3,6 @@
 from itertools import combinations
 
 from txoauth2 import GrantTypes
-from txoauth2.token import TokenResource
 from txoauth2.errors import MissingParameterError, MultipleParameterError, InvalidTokenError, \
     InvalidScopeError, UnauthorizedClientError
 
@@ -25,10 +24,7 @@ class TestTokenRefresh(Abstract.TokenResourceTest):
         :param token: The token that should get generated.
         :param lifetime: The default and expected lifetime of the token.
         """
-        tokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, authTokenLifeTime=lifetime,
-            passwordManager=self._PASSWORD_MANAGER)
+        tokenResource = self._getTokenResource(authTokenLifeTime=lifetime)
         request = self.generateValidTokenRequest(arguments={
             'grant_type': 'refresh_token',
             'refresh_token': self._VALID_REFRESH_TOKEN
@@ -233,10 +229,7 @@ class TestTokenRefresh(Abstract.TokenResourceTest):
         newRefreshToken = 'newRefreshToken'
         self._REFRESH_TOKEN_STORAGE.store(
             oldRefreshToken, self._VALID_CLIENT, self._VALID_SCOPE, additionalData)
-        tokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, minRefreshTokenLifeTime=0,
-            passwordManager=self._PASSWORD_MANAGER)
+        tokenResource = self._getTokenResource(minRefreshTokenLifeTime=0)
         request = self.generateValidTokenRequest(arguments={
             'grant_type': 'refresh_token',
             'refresh_token': oldRefreshToken
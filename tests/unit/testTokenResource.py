@@ -1,7 +1,17 @@
 """ Tests for the token resource. """
 
-import json
 import warnings
+try:
+    from orjson import loads as _loadJson
+except ImportError:
+    import json
+
+    def _loadJson(data):
+        """
+        :param data: The utf-8 encoded json data.
+        :return: The decoded json data.
+        """
+        return json.loads(data.decode('utf-8'))
 
 from twisted.web import error
 from twisted.web.server import NOT_DONE_YET
@@ -19,14 +29,48 @@ from tests import TwistedTestCase, TestTokenFactory, getTestPasswordClient, Test
     MockRequest, TestPasswordManager, TestPersistentStorage
 
 
+_EXPECTED_RESPONSE_HEADERS = ('application/json;charset=UTF-8', 'no-store', 'no-cache')
+_RESPONSE_HEADERS_MSG = ' and to set Cache-Control to "no-store" and Pragma to "no-cache".'
+_CODE_MSG_TEMPLATE = 'Expected the token resource to return a response with the HTTP code %d.'
+# The name, article and description of the parameters of a successful token response.
+_TOKEN_RESPONSE_PARAMETERS = (
+    ('access_token', 'an', 'access token'),
+    ('token_type', 'a', 'access token type'),
+    ('expires_in', 'an', 'access token expire time'),
+    ('refresh_token', 'a', 'refresh token'),
+    ('scope', 'a', 'scope'),
+)
+
+
+def getJsonResponse(request, result):
+    """
+    Decode the json response body of a request to the token resource. The decoded body
+    is cached on the request together with the result it was decoded from,
+    so multiple assertions about one response only decode it once.
+    :param request: The request.
+    :param result: The response body that was written to the request.
+    :return: The decoded json response.
+    """
+    cachedResult, jsonResponse = getattr(request, '_parsedJson', (None, None))
+    if cachedResult is not result:
+        jsonResponse = _loadJson(result)
+        request._parsedJson = result, jsonResponse  # pylint: disable=protected-access
+    return jsonResponse
+
+
 class Abstract(object):
     """ Wrapper for the abstract TokenResourceTest to hide it during test discovery. """
 
     class TokenResourceTest(TwistedTestCase):
         """ Abstract base class for test targeting the token resource. """
         _VALID_REFRESH_TOKEN = 'refreshToken'
+        _REFRESH_TOKEN_ARGUMENTS = {
+            'grant_type': 'refresh_token',
+            'refresh_token': _VALID_REFRESH_TOKEN
+        }
         _VALID_SCOPE = ['All', 'scope']
         _VALID_CLIENT = getTestPasswordClient()
+        _FORM_CONTENT_TYPE_HEADER = {b'Content-Type': b'application/x-www-form-urlencoded'}
 
         @classmethod
         def setUpClass(cls):
@@ -36,13 +80,12 @@ class Abstract(object):
             cls._TOKEN_FACTORY = TestTokenFactory()
             cls._PERSISTENT_STORAGE = TestPersistentStorage()
             cls._CLIENT_STORAGE = TestClientStorage()
-            cls._REFRESH_TOKEN_STORAGE.store(
-                cls._VALID_REFRESH_TOKEN, cls._VALID_CLIENT, cls._VALID_SCOPE)
             cls._CLIENT_STORAGE.addClient(cls._VALID_CLIENT)
             cls._PASSWORD_MANAGER = TestPasswordManager()
-            cls._TOKEN_RESOURCE = TokenResource(
-                cls._TOKEN_FACTORY, cls._PERSISTENT_STORAGE, cls._REFRESH_TOKEN_STORAGE,
-                cls._AUTH_TOKEN_STORAGE, cls._CLIENT_STORAGE, passwordManager=cls._PASSWORD_MANAGER)
+            cls._RESOURCE_CACHE = {}
+            cls._TOKEN_RESOURCE = cls._getTokenResource()
+            cls._RENDER_METHODS = [name[7:] for name in vars(TokenResource)
+                                   if name.startswith('render_')]
 
         @classmethod
         def tearDownClass(cls):
@@ -50,9 +93,31 @@ class Abstract(object):
 
         def setUp(self):
             self._TOKEN_FACTORY.reset(self)
+            # Drop the tokens of the previous tests, but keep the valid refresh token.
+            self._AUTH_TOKEN_STORAGE.clear()
+            self._REFRESH_TOKEN_STORAGE.clear()
+            self._REFRESH_TOKEN_STORAGE.store(
+                self._VALID_REFRESH_TOKEN, self._VALID_CLIENT, self._VALID_SCOPE)
+
+        @classmethod
+        def _getTokenResource(cls, **kwargs):
+            """
+            Get a token resource that uses the storages of the test case. The token resources
+            are cached, so each configuration is only created once per test class.
+            :param kwargs: Additional keyword arguments to the TokenResource constructor.
+            :return: The token resource.
+            """
+            key = frozenset((name, tuple(value) if isinstance(value, list) else value)
+                            for name, value in kwargs.items())
+            if key not in cls._RESOURCE_CACHE:
+                kwargs.setdefault('passwordManager', cls._PASSWORD_MANAGER)
+                cls._RESOURCE_CACHE[key] = TokenResource(
+                    cls._TOKEN_FACTORY, cls._PERSISTENT_STORAGE, cls._REFRESH_TOKEN_STORAGE,
+                    cls._AUTH_TOKEN_STORAGE, cls._CLIENT_STORAGE, **kwargs)
+            return cls._RESOURCE_CACHE[key]
 
-        @staticmethod
-        def _addAuthenticationToRequestHeader(request, client):
+        @classmethod
+        def _addAuthenticationToRequestHeader(cls, request, client):
             """ Add authentication with the clients credentials to the header of the request. """
             request.addAuthorization(client.id, client.secret)
 
@@ -67,8 +132,7 @@ class Abstract(object):
             """
             if urlQuery:
                 url = '?'.join((url, urlQuery))
-            request = MockRequest('POST', url, **kwargs)
-            request.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded')
+            request = MockRequest('POST', url, headers=cls._FORM_CONTENT_TYPE_HEADER, **kwargs)
             if authentication is not None:
                 cls._addAuthenticationToRequestHeader(request, authentication)
             return request
@@ -90,62 +154,31 @@ class Abstract(object):
             :param expectedAdditionalData: The optional additional data of the new tokens.
             """
             self.assertEqual(
-                'application/json;charset=UTF-8', request.getResponseHeader('Content-Type'),
-                msg='Expected the token resource to return the token in the json format.')
-            self.assertEqual('no-store', request.getResponseHeader('Cache-Control'),
-                             msg='Expected the token resource to set Cache-Control to "no-store".')
-            self.assertEqual('no-cache', request.getResponseHeader('Pragma'),
-                             msg='Expected the token resource to set Pragma to "no-cache".')
+                _EXPECTED_RESPONSE_HEADERS,
+                (request.getResponseHeader('Content-Type'),
+                 request.getResponseHeader('Cache-Control'), request.getResponseHeader('Pragma')),
+                msg='Expected the token resource to return the token in the json format'
+                    + _RESPONSE_HEADERS_MSG)
             self.assertEqual(200, request.responseCode,
                              msg='Expected the token resource to return '
                                  'a new token with the HTTP code 200 OK.')
-            jsonResult = json.loads(result.decode('utf-8'))
-            self.assertIn('access_token', jsonResult,
-                          msg='Expected the result from the token resource '
-                              'to contain an access_token parameter.')
-            self.assertEqual(
-                expectedAccessToken, jsonResult['access_token'],
-                msg='The token resource returned a different access token than expected.')
-            self.assertIn('token_type', jsonResult,
-                          msg='Expected the result from the token resource '
-                              'to contain a token_type parameter.')
-            self.assertEqual(
-                expectedTokenType.lower(), jsonResult['token_type'].lower(),
-                msg='The token resource returned a different access token type than expected.')
-            if expectedExpireTime is None:
-                self.assertNotIn('expires_in', jsonResult,
-                                 msg='Expected the result from the token resource '
-                                     'to not contain an expires_in parameter.')
-            else:
-                self.assertIn('expires_in', jsonResult,
-                              msg='Expected the result from the token resource '
-                                  'to contain an expires_in parameter.')
-                self.assertEqual(expectedExpireTime, jsonResult['expires_in'],
-                                 msg='The token resource returned a different '
-                                     'access token expire time than expected.')
-            if expectedRefreshToken is None:
-                self.assertNotIn('refresh_token', jsonResult,
-                                 msg='Expected the result from the token resource '
-                                     'to not contain a refresh_token parameter.')
-            else:
-                self.assertIn('refresh_token', jsonResult,
-                              msg='Expected the result from the token resource '
-                                  'to contain a refresh_token parameter.')
-                self.assertEqual(expectedRefreshToken, jsonResult['refresh_token'],
-                                 msg='The token resource returned a different '
-                                     'refresh token than expected.')
+            jsonResult = getJsonResponse(request, result)
+            expectedResult = {
+                'access_token': expectedAccessToken,
+                'token_type': expectedTokenType.lower()
+            }
+            if expectedExpireTime is not None:
+                expectedResult['expires_in'] = expectedExpireTime
+            if expectedRefreshToken is not None:
+                expectedResult['refresh_token'] = expectedRefreshToken
+            if expectedScope is not None:
+                expectedResult['scope'] = ' '.join(expectedScope)
+            if expectedResult != dict(jsonResult,
+                                      token_type=jsonResult.get('token_type', '').lower()):
+                # Check every parameter separately to report what is wrong.
+                self._assertTokenResponseParameters(jsonResult, expectedResult)
             if expectedScope is None:
-                self.assertNotIn('scope', jsonResult,
-                                 msg='Expected the result from the token resource '
-                                     'to not contain a scope parameter.')
                 expectedScope = self._VALID_SCOPE
-            else:
-                self.assertIn('scope', jsonResult,
-                              msg='Expected the result from the token resource '
-                                  'to contain a scope parameter.')
-                self.assertListEqual(jsonResult['scope'].split(), expectedScope,
-                                     msg='The token resource returned a different '
-                                         'scope than expected.')
             self.assertTrue(self._AUTH_TOKEN_STORAGE.contains(expectedAccessToken),
                             msg='Expected the token storage to contain the new access token.')
             self.assertTrue(
@@ -163,9 +196,34 @@ class Abstract(object):
                     msg='Expected the refresh token to have access to the expected scope.')
                 self.assertEqual(
                     expectedAdditionalData,
-                    self._REFRESH_TOKEN_STORAGE.getTokenAdditionalData(expectedAccessToken),
+                    self._REFRESH_TOKEN_STORAGE.getTokenAdditionalData(expectedRefreshToken),
                     msg='Expected the new refresh token to have the expected additional data.')
 
+        def _assertTokenResponseParameters(self, jsonResult, expectedResult):
+            """
+            Assert that the decoded response of the token resource contains the expected parameters.
+            :param jsonResult: The decoded response of the token resource.
+            :param expectedResult: The expected parameters of the response.
+            """
+            for name, article, description in _TOKEN_RESPONSE_PARAMETERS:
+                if name not in expectedResult:
+                    self.assertNotIn(name, jsonResult,
+                                     msg='Expected the result from the token resource to not '
+                                         'contain {article} {name} parameter.'.format(
+                                             article=article, name=name))
+                    continue
+                self.assertIn(name, jsonResult,
+                              msg='Expected the result from the token resource to contain '
+                                  '{article} {name} parameter.'.format(article=article, name=name))
+                value, expectedValue = jsonResult[name], expectedResult[name]
+                if name == 'token_type':
+                    value = value.lower()
+                elif name == 'scope':
+                    value, expectedValue = value.split(), expectedValue.split()
+                self.assertEqual(expectedValue, value,
+                                 msg='The token resource returned a different {description} '
+                                     'than expected.'.format(description=description))
+
         def assertFailedTokenRequest(self, request, result, expectedError, msg):
             """
             Assert that the request did not succeed and that
@@ -180,16 +238,14 @@ class Abstract(object):
             if msg.endswith('.'):
                 msg = msg[:-1]
             self.assertEqual(
-                'application/json;charset=UTF-8', request.getResponseHeader('Content-Type'),
-                msg='Expected the token resource to return an error in the json format.')
-            self.assertEqual('no-store', request.getResponseHeader('Cache-Control'),
-                             msg='Expected the token resource to set Cache-Control to "no-store".')
-            self.assertEqual('no-cache', request.getResponseHeader('Pragma'),
-                             msg='Expected the token resource to set Pragma to "no-cache".')
+                _EXPECTED_RESPONSE_HEADERS,
+                (request.getResponseHeader('Content-Type'),
+                 request.getResponseHeader('Cache-Control'), request.getResponseHeader('Pragma')),
+                msg='Expected the token resource to return an error in the json format'
+                    + _RESPONSE_HEADERS_MSG)
             self.assertEqual(expectedError.code, request.responseCode,
-                             msg='Expected the token resource to return a response '
-                                 'with the HTTP code {code}.'.format(code=expectedError.code))
-            errorResult = json.loads(result.decode('utf-8'))
+                             msg=_CODE_MSG_TEMPLATE % expectedError.code)
+            errorResult = getJsonResponse(request, result)
             self.assertIn('error', errorResult, msg=msg + ': Missing error parameter in response.')
             self.assertEqual(expectedError.name, errorResult['error'],
                              msg=msg + ': Result contained a different error than expected.')
@@ -212,9 +268,8 @@ class Abstract(object):
                     authenticateResponse,
                     msg='If the request has authentication via the "Authorization" header field, '
                         'the result must include the "WWW-Authenticate" response header field.')
-                authType, _ = authenticateResponse.split(' ', 1)
-                self.assertEqual(
-                    'Bearer', authType,
+                self.assertTrue(
+                    authenticateResponse.startswith('Bearer '),
                     msg='Expected an WWW-Authenticate response to use the Bearer scheme.')
                 expectedHeaderValue = 'realm="' + request.prePathURL().decode('utf-8') + '"'
                 self.assertIn(expectedHeaderValue, authenticateResponse,
@@ -231,22 +286,17 @@ class TestTokenResource(Abstract.TokenResourceTest):
         Test the rejection of a request via an insecure transport,
         except if allowInsecureRequestDebug is set to true.
         """
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        }, authentication=self._VALID_CLIENT, isSecure=False)
+        request = self.generateValidTokenRequest(
+            arguments=self._REFRESH_TOKEN_ARGUMENTS, authentication=self._VALID_CLIENT,
+            isSecure=False)
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
             request, result, InsecureConnectionError(),
             msg='Expected the token resource to reject a request made via an insecure transport')
-        debugTokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, allowInsecureRequestDebug=True,
-            passwordManager=self._PASSWORD_MANAGER)
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        }, authentication=self._VALID_CLIENT, isSecure=False)
+        debugTokenResource = self._getTokenResource(allowInsecureRequestDebug=True)
+        request = self.generateValidTokenRequest(
+            arguments=self._REFRESH_TOKEN_ARGUMENTS, authentication=self._VALID_CLIENT,
+            isSecure=False)
         newAuthToken = 'tokenViaInsecureConnection'
         self._TOKEN_FACTORY.expectTokenRequest(
             newAuthToken, debugTokenResource.authTokenLifeTime,
@@ -261,13 +311,12 @@ class TestTokenResource(Abstract.TokenResourceTest):
         """ Test the rejection of any request that is not a POST request. """
         self.assertListEqual([b'POST'], self._TOKEN_RESOURCE.allowedMethods,
                              msg='Expected the token resource to only accept POST requests.')
-        methods = [name[7:] for name in dir(self._TOKEN_RESOURCE)
-                   if name.startswith('render_') and callable(getattr(self._TOKEN_RESOURCE, name))]
-        for method in methods:
+        request = MockRequest('GET', 'token')
+        for method in self._RENDER_METHODS:
             if method == 'POST':
                 continue
-            self.assertRaises(error.UnsupportedMethod, self._TOKEN_RESOURCE.render,
-                              MockRequest(method, 'token'))
+            request.method = method.encode('utf-8')
+            self.assertRaises(error.UnsupportedMethod, self._TOKEN_RESOURCE.render, request)
         try:
             self._TOKEN_RESOURCE.render(MockRequest('POST', 'token'))
         except error.UnsupportedMethod:
@@ -275,10 +324,7 @@ class TestTokenResource(Abstract.TokenResourceTest):
 
     def testInvalidContentType(self):
         """ Test the rejection requests whose content is not "x-www-form-urlencoded". """
-        request = MockRequest('POST', 'token', arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        })
+        request = MockRequest('POST', 'token', arguments=self._REFRESH_TOKEN_ARGUMENTS)
         request.setRequestHeader('Content-Type', 'application/not-x-www-form-urlencoded')
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
@@ -288,10 +334,9 @@ class TestTokenResource(Abstract.TokenResourceTest):
 
     def testIgnoresUnrecognizedArgs(self):
         """ Test that unrecognized parameter are ignored. """
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        }, urlQuery='unrecognized=1', authentication=self._VALID_CLIENT)
+        request = self.generateValidTokenRequest(
+            arguments=self._REFRESH_TOKEN_ARGUMENTS, urlQuery='unrecognized=1',
+            authentication=self._VALID_CLIENT)
         newAuthToken = 'tokenWithUnrecognizedArgs'
         self._TOKEN_FACTORY.expectTokenRequest(newAuthToken, self._TOKEN_RESOURCE.authTokenLifeTime,
                                                self._VALID_CLIENT, self._VALID_SCOPE)
@@ -328,9 +373,7 @@ class TestTokenResource(Abstract.TokenResourceTest):
         self.assertFailedTokenRequest(
             request, result, UnsupportedGrantTypeError(grantType),
             msg='Expected the token resource to reject a request with an unknown grant type.')
-        tokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, grantTypes=[grantType])
+        tokenResource = self._getTokenResource(grantTypes=[grantType])
         result = tokenResource.render_POST(request)
         self.assertFailedTokenRequest(
             request, result, UnsupportedGrantTypeError(grantType),
@@ -364,12 +407,19 @@ class TestTokenResource(Abstract.TokenResourceTest):
         self.assertFalse(TokenResource.isValidToken('an invalid Token'),
                          msg='Expected isValidToken to accept an invalid token.')
 
+        class PaddedTokenResource(TokenResource):
+            """ A token resource that also accepts padded base64 tokens. """
+            VALID_TOKEN_CHARS = TokenResource.VALID_TOKEN_CHARS + '='
+
+        self.assertTrue(PaddedTokenResource.isValidToken('aValidToken='),
+                        msg='Expected isValidToken to use the VALID_TOKEN_CHARS of a subclass.')
+        self.assertFalse(TokenResource.isValidToken('aValidToken='),
+                         msg='Expected isValidToken to not use the VALID_TOKEN_CHARS '
+                             'of a subclass for the base class.')
+
     def testAuthorizationWithoutClientAuth(self):
         """ Test the rejection of a request without client authentication. """
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        })
+        request = self.generateValidTokenRequest(arguments=self._REFRESH_TOKEN_ARGUMENTS)
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
             request, result, NoClientAuthenticationError(),
@@ -386,10 +436,7 @@ class TestTokenResource(Abstract.TokenResourceTest):
 
     def testAuthorizationClientAuthInHeader(self):
         """ Test that a request with valid client authentication in the header is accepted. """
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        })
+        request = self.generateValidTokenRequest(arguments=self._REFRESH_TOKEN_ARGUMENTS)
         self._addAuthenticationToRequestHeader(request, self._VALID_CLIENT)
         newAuthToken = 'tokenWithAuthInHeader'
         self._TOKEN_FACTORY.expectTokenRequest(newAuthToken, self._TOKEN_RESOURCE.authTokenLifeTime,
@@ -494,10 +541,7 @@ class TestTokenResource(Abstract.TokenResourceTest):
 
     def testAuthorizationMalformedClientIdInHeader(self):
         """ Test the rejection of a request with a malformed client id in the header. """
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        })
+        request = self.generateValidTokenRequest(arguments=self._REFRESH_TOKEN_ARGUMENTS)
         request.addAuthorization(b'malformedId\xFF\xFF', b'clientSecret')
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
@@ -509,10 +553,7 @@ class TestTokenResource(Abstract.TokenResourceTest):
         """ Test the rejection of a request with a malformed client secret in the header. """
         client = getTestPasswordClient('malformedSecret')
         client.secret = b'malformedSecret\xFF\xFF'
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        })
+        request = self.generateValidTokenRequest(arguments=self._REFRESH_TOKEN_ARGUMENTS)
         self._addAuthenticationToRequestHeader(request, client)
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
@@ -537,10 +578,7 @@ class TestTokenResource(Abstract.TokenResourceTest):
         """ Test the rejection of a request with an invalid client in the headers. """
         client = getTestPasswordClient('invalidClientId')
         client.secret = self._VALID_CLIENT.secret
-        request = self.generateValidTokenRequest(arguments={
-            'grant_type': 'refresh_token',
-            'refresh_token': self._VALID_REFRESH_TOKEN
-        })
+        request = self.generateValidTokenRequest(arguments=self._REFRESH_TOKEN_ARGUMENTS)
         self._addAuthenticationToRequestHeader(request, client)
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
@@ -573,14 +611,25 @@ class TestTokenResource(Abstract.TokenResourceTest):
             request, result, InvalidClientAuthenticationError(),
             msg='Expected the token resource to reject a request with an invalid client secret.')
 
-    def testAuthorizationWrongClientSecretInHeader(self):
-        """ Test the rejection of a request with an invalid client secret in the header. """
-        client = getTestPasswordClient(self._VALID_CLIENT.id)
-        client.secret = 'invalidSecret'
+    def testAuthorizationWrongNonAsciiClientSecret(self):
+        """ Test the rejection of a request with an invalid non ascii client secret. """
         request = self.generateValidTokenRequest(arguments={
             'grant_type': 'refresh_token',
+            'client_id': self._VALID_CLIENT.id,
+            'client_secret': u'invalidSecret\u00e4',
             'refresh_token': self._VALID_REFRESH_TOKEN
         })
+        result = self._TOKEN_RESOURCE.render_POST(request)
+        self.assertFailedTokenRequest(
+            request, result, InvalidClientAuthenticationError(),
+            msg='Expected the token resource to reject a request '
+                'with an invalid non ascii client secret.')
+
+    def testAuthorizationWrongClientSecretInHeader(self):
+        """ Test the rejection of a request with an invalid client secret in the header. """
+        client = getTestPasswordClient(self._VALID_CLIENT.id)
+        client.secret = 'invalidSecret'
+        request = self.generateValidTokenRequest(arguments=self._REFRESH_TOKEN_ARGUMENTS)
         self._addAuthenticationToRequestHeader(request, client)
         result = self._TOKEN_RESOURCE.render_POST(request)
         self.assertFailedTokenRequest(
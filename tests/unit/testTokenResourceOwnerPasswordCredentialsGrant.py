@@ -1,6 +1,5 @@
 """ Test the password grant flow. """
 
-from txoauth2.token import TokenResource
 from txoauth2.errors import UnauthorizedClientError, MissingParameterError, InvalidTokenError, \
     MultipleParameterError, InvalidScopeError, UnsupportedGrantTypeError
 
@@ -160,10 +159,7 @@ class TestResourceOwnerPasswordCredentialsGrant(Abstract.TokenResourceTest):
         defaultScope = ['default', 'scope']
         authToken = 'resourceOwnerPasswordCredentialsTokenWithoutScope'
         refreshToken = 'resourceOwnerPasswordCredentialsRefreshTokenWithoutScope'
-        tokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, defaultScope=defaultScope,
-            passwordManager=self._PASSWORD_MANAGER)
+        tokenResource = self._getTokenResource(defaultScope=defaultScope)
         request = self.generateValidTokenRequest(arguments={
             'grant_type': 'password',
             'username': userName,
@@ -253,9 +249,7 @@ class TestResourceOwnerPasswordCredentialsGrant(Abstract.TokenResourceTest):
 
     def testWhenDisabled(self):
         """ Test the rejection of a password request when the grant type is disabled. """
-        tokenResource = TokenResource(
-            self._TOKEN_FACTORY, self._PERSISTENT_STORAGE, self._REFRESH_TOKEN_STORAGE,
-            self._AUTH_TOKEN_STORAGE, self._CLIENT_STORAGE, grantTypes=[])
+        tokenResource = self._getTokenResource(grantTypes=[])
         request = self.generateValidTokenRequest(arguments={
             'grant_type': 'password',
             'username': b'someUserName',
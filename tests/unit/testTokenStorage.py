@@ -262,3 +262,108 @@ class DictTokenStorageTest(Abstract.TokenStorageTest):
     @classmethod
     def setUpClass(cls):
         cls.setupTokenStorage(DictTokenStorage())
+
+    def testGetTokensForClient(self):
+        """ Test that getTokensForClient returns all valid tokens of a client. """
+        client = getTestPasswordClient('tokensForClientTestClient')
+        tokens = ['clientToken1', 'clientToken2', 'clientToken3']
+        for token in tokens:
+            self._TOKEN_STORAGE.store(token, client, self._VALID_SCOPE)
+        self.assertListEqual(sorted(tokens), sorted(self._TOKEN_STORAGE.getTokensForClient(
+            client.id)), msg='Expected getTokensForClient to return all tokens of the client.')
+        self._TOKEN_STORAGE.remove(tokens[0])
+        self._TOKEN_STORAGE.store(tokens[1], self._DUMMY_CLIENT, self._VALID_SCOPE)
+        self.assertListEqual(
+            [tokens[2]], self._TOKEN_STORAGE.getTokensForClient(client.id),
+            msg='Expected getTokensForClient to not return tokens that were removed '
+                'or stored again for a different client.')
+        self.assertListEqual([], self._TOKEN_STORAGE.getTokensForClient('unknownClientId'),
+                             msg='Expected getTokensForClient to return an empty list '
+                                 'for a client without tokens.')
+
+    def testPurgeExpired(self):
+        """ Test that purgeExpired removes exactly the expired tokens. """
+        client = getTestPasswordClient('purgeExpiredTestClient')
+        self._TOKEN_STORAGE.store('purgedToken', client, self._VALID_SCOPE,
+                                  expireTime=time.time() + 0.1)
+        self._TOKEN_STORAGE.store('renewedToken', client, self._VALID_SCOPE,
+                                  expireTime=time.time() + 0.1)
+        self._TOKEN_STORAGE.store('futureToken', client, self._VALID_SCOPE,
+                                  expireTime=time.time() + 60)
+        self._TOKEN_STORAGE.store('renewedToken', client, self._VALID_SCOPE)
+        time.sleep(0.2)
+        self._TOKEN_STORAGE.purgeExpired()
+        # pylint: disable=protected-access
+        self.assertNotIn('purgedToken', self._TOKEN_STORAGE._tokens,
+                         msg='Expected purgeExpired to remove the expired token.')
+        self.assertTrue(self._TOKEN_STORAGE.contains('renewedToken'),
+                        msg='Expected purgeExpired to keep a token that was stored again '
+                            'without an expire time.')
+        self.assertTrue(self._TOKEN_STORAGE.contains('futureToken'),
+                        msg='Expected purgeExpired to keep a token that has not expired.')
+        self.assertTrue(self._TOKEN_STORAGE.contains(self._VALID_TOKEN),
+                        msg='Expected purgeExpired to keep a token without an expire time.')
+        self.assertListEqual(
+            ['futureToken', 'renewedToken'],
+            sorted(self._TOKEN_STORAGE.getTokensForClient(client.id)),
+            msg='Expected purgeExpired to remove the expired token from the client index.')
+
+    def testExpireTimesDoNotAccumulate(self):
+        """ Test that removed and stored again tokens don't leave their expire times behind. """
+        client = getTestPasswordClient('expireTimesTestClient')
+        tokenStorage = DictTokenStorage()
+        for _ in range(100):
+            tokenStorage.store('removedToken', client, self._VALID_SCOPE,
+                               expireTime=time.time() + 60)
+            tokenStorage.store('renewedToken', client, self._VALID_SCOPE,
+                               expireTime=time.time() + 30)
+            tokenStorage.remove('removedToken')
+        # pylint: disable=protected-access
+        self.assertLessEqual(len(tokenStorage._expireTimes), 4,
+                             msg='Expected the token storage to drop the expire times '
+                                 'of tokens that are no longer stored.')
+
+    def testCheckExpireRemovesExpiredTokens(self):
+        """ Test that checking any token removes all tokens that have expired. """
+        client = getTestPasswordClient('checkExpireTestClient')
+        tokenStorage = DictTokenStorage()
+        tokenStorage.store('expiredToken', client, self._VALID_SCOPE, expireTime=time.time() + 0.1)
+        tokenStorage.store('futureToken', client, self._VALID_SCOPE, expireTime=time.time() + 60)
+        time.sleep(0.2)
+        self.assertTrue(tokenStorage.contains('futureToken'),
+                        msg='Expected the token storage to contain the token has not expired.')
+        # pylint: disable=protected-access
+        self.assertNotIn('expiredToken', tokenStorage._tokens,
+                         msg='Expected the token storage to remove the expired token '
+                             'while checking another token.')
+        self.assertEqual('futureToken', tokenStorage._expireTimes[0][1],
+                         msg='Expected the token storage to drop the expire time '
+                             'of the expired token.')
+
+    def testClear(self):
+        """ Test that clear removes all tokens from the token storage. """
+        client = getTestPasswordClient('clearTestClient')
+        tokenStorage = DictTokenStorage()
+        tokenStorage.store('clearedToken', client, self._VALID_SCOPE, expireTime=time.time() + 60)
+        tokenStorage.clear()
+        self.assertFalse(tokenStorage.contains('clearedToken'),
+                         msg='Expected the token storage to not contain a token after clear.')
+        self.assertListEqual([], tokenStorage.getTokensForClient(client.id),
+                             msg='Expected clear to remove the tokens from the client index.')
+
+    def testScopeCollections(self):
+        """ Test that tuples and sets are accepted as a collection of scopes. """
+        self._TOKEN_STORAGE.store('tupleScopeToken', self._DUMMY_CLIENT, tuple(self._VALID_SCOPE))
+        self.assertListEqual(
+            self._VALID_SCOPE, self._TOKEN_STORAGE.getTokenScope('tupleScopeToken'),
+            msg='Expected the token storage to store a tuple of scopes as a list.')
+        self._TOKEN_STORAGE.store('setScopeToken', self._DUMMY_CLIENT, set(self._VALID_SCOPE))
+        self.assertListEqual(
+            sorted(self._VALID_SCOPE), sorted(self._TOKEN_STORAGE.getTokenScope('setScopeToken')),
+            msg='Expected the token storage to store a set of scopes as a list.')
+        self.assertTrue(
+            self._TOKEN_STORAGE.hasAccess('tupleScopeToken', tuple(self._VALID_SCOPE)),
+            msg='Expected hasAccess to accept a tuple of scopes.')
+        self.assertFalse(
+            self._TOKEN_STORAGE.hasAccess('setScopeToken', {self._VALID_SCOPE[0], 'invalidScope'}),
+            msg='Expected hasAccess to check every scope in a set of scopes.')
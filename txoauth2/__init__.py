@@ -3,6 +3,7 @@
 """ Allows implementing OAuth2 with twisted. """
 
 from .authorization import oauth2, isAuthorized
-from .granttypes import GrantTypes
+from .granttypes import GrantTypes, GRANT_TYPES_TUPLE
 
-__all__ = ['isAuthorized', 'oauth2', 'clients', 'errors', 'imp', 'resource', 'token', 'GrantTypes']
+__all__ = ['isAuthorized', 'oauth2', 'clients', 'errors', 'imp', 'resource', 'token', 'GrantTypes',
+           'GRANT_TYPES_TUPLE']
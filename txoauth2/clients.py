@@ -5,12 +5,12 @@
 from abc import abstractmethod, ABCMeta
 
 try:
-    from urlparse import urlparse
+    from urlparse import urlsplit
 except ImportError:
     # noinspection PyUnresolvedReferences
-    from urllib.parse import urlparse
+    from urllib.parse import urlsplit
 
-from txoauth2.util import isAnyStr
+from txoauth2.util import isAnyStr, secretEquals
 from txoauth2.granttypes import GrantTypes
 from txoauth2.errors import InvalidClientAuthenticationError, NoClientAuthenticationError
 
@@ -33,7 +33,7 @@ class ClientStorage(object):
         :return: The client that was authenticated by the request.
         """
         if secret is not None:
-            if isinstance(client, PasswordClient) and client.secret == secret:
+            if isinstance(client, PasswordClient) and secretEquals(secret, client.secret):
                 return client
             raise InvalidClientAuthenticationError()
         raise NoClientAuthenticationError()
@@ -74,14 +74,7 @@ class Client(object):
             raise ValueError('Expected redirectUris to be of type list, got '
                              + str(type(redirectUris)))
         for uri in redirectUris:
-            if not isinstance(uri, str):
-                raise ValueError('Expected the redirectUris to be of type str, got '
-                                 + str(type(uri)))
-            parsedUri = urlparse(uri)
-            if parsedUri.fragment != '':
-                raise ValueError('Got a redirect uri with a fragment: ' + uri)
-            if parsedUri.netloc == '':
-                raise ValueError('Got a redirect uri that is not absolute: ' + uri)
+            self._validateRedirectUri(uri)
         if not isinstance(authorizedGrantTypes, list):
             raise ValueError('Expected authorizedGrantTypes to be of type list, got '
                              + str(type(authorizedGrantTypes)))
@@ -95,6 +88,22 @@ class Client(object):
         self.redirectUris = redirectUris
         self.authorizedGrantTypes = authorizedGrantTypes
 
+    @staticmethod
+    def _validateRedirectUri(uri):
+        """
+        :raises ValueError: If the uri is not a string, has a fragment or is relative.
+        :param uri: The redirect uri to validate.
+        """
+        if not isinstance(uri, str):
+            raise ValueError('Expected the redirectUris to be of type str, got ' + str(type(uri)))
+        if '#' in uri:
+            raise ValueError('Got a redirect uri with a fragment: ' + uri)
+        if '://' not in uri:
+            raise ValueError('Got a redirect uri that is not absolute: ' + uri)
+        scheme, netloc, _, _, _ = urlsplit(uri)
+        if scheme == '' or netloc == '':
+            raise ValueError('Got a redirect uri that is not absolute: ' + uri)
+
 
 class PublicClient(Client):
     """
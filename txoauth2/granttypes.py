@@ -12,3 +12,7 @@ class GrantTypes(Enum):
     CLIENT_CREDENTIALS = 'client_credentials'
     PASSWORD = 'password'
     IMPLICIT = 'implicit'
+
+
+# All members of GrantTypes, materialized once.
+GRANT_TYPES_TUPLE = tuple(GrantTypes)
@@ -2,15 +2,20 @@
 # See LICENSE for details.
 """ Implementations to some of the abstract classes used by this module. """
 
+import heapq
+import json
 import os
 import time
 
+from base64 import urlsafe_b64encode
 from uuid import uuid4
 try:
-    from ConfigParser import RawConfigParser
+    from ConfigParser import RawConfigParser, NoOptionError
+    from StringIO import StringIO
 except ImportError:
     # noinspection PyUnresolvedReferences
-    from configparser import RawConfigParser
+    from configparser import RawConfigParser, NoOptionError
+    from io import StringIO
 
 from txoauth2.clients import ClientStorage, Client
 from txoauth2.token import TokenFactory, TokenStorage, PersistentStorage
@@ -25,88 +30,296 @@ class UUIDTokenFactory(TokenFactory):
         :param client: Unused.
         :param scope: Unused.
         :param additionalData: Unused.
-        :return: An UUID token.
+        :return: An UUID token as 32 hexadecimal digits without hyphens.
         """
-        return str(uuid4())
+        return uuid4().hex
+
+
+class RandomTokenFactory(TokenFactory):
+    """
+    A TokenFactory that generates url safe tokens from cryptographically secure random bytes.
+    This is cheaper than generating UUID tokens and the tokens carry more entropy.
+    """
+    def __init__(self, numBytes=32):
+        """
+        :param numBytes: The number of random bytes that are encoded into each token.
+        """
+        super(RandomTokenFactory, self).__init__()
+        self.numBytes = numBytes
+
+    def generateToken(self, lifetime, client, scope, additionalData=None):
+        """
+        Generate a random token.
+        :param lifetime: Unused.
+        :param client: Unused.
+        :param scope: Unused.
+        :param additionalData: Unused.
+        :return: A random token.
+        """
+        token = urlsafe_b64encode(os.urandom(self.numBytes)).rstrip(b'=')
+        if not isinstance(token, str):  # Python 3 returns bytes
+            token = token.decode('ascii')
+        return token
+
+
+def _findClientClasses():
+    """
+    :return: All subclasses of Client.
+    """
+    classes = set()
+    newClasses = {Client}
+    while len(newClasses) != 0:
+        newClasses = {subclass for cls in newClasses for subclass in cls.__subclasses__()}
+        newClasses -= classes
+        classes |= newClasses
+    return classes
+
+
+def _createClient(clientClass, clientId, redirectUris, authorizedGrantTypes, kwargs):
+    """
+    Create a new client from the cached arguments of a client storage. Every call returns
+    a new client, so callers can't change the client that is returned by later calls.
+    :param clientClass: The class of the client.
+    :param clientId: The id of the client.
+    :param redirectUris: The redirect uris of the client.
+    :param authorizedGrantTypes: The grant types that the client is authorized to use.
+    :param kwargs: Additional keyword arguments to the constructor of the client class.
+    :return: The new client.
+    """
+    return clientClass(clientId, list(redirectUris), list(authorizedGrantTypes), **kwargs)
 
 
 class ConfigParserClientStorage(ClientStorage):
     """ A ClientStorage using a ConfigParser. """
     _configParser = None
+    _configFile = None
+    _dirty = False
+    _directoryCreated = False
     path = None
 
-    def __init__(self, path):
+    def __init__(self, path, autoSave=True):
         """
         Initialize a new SimpleClientStorage which loads and stores
         it's clients from the given path.
         :param path: Path to a config file to load and store clients.
+                     Alternatively, an open file object which is read from
+                     and rewritten in place instead of a file on disk.
+        :param autoSave: Whether addClient writes the config file immediately.
+                         If False, the changes are only written by calling save.
         """
         super(ConfigParserClientStorage, self).__init__()
+        self.autoSave = autoSave
         self._configParser = RawConfigParser()
-        self.path = os.path.abspath(path)
-        self._configParser.read(self.path)
-        self._clientClasses = self._findClientClasses()
+        if hasattr(path, 'read'):
+            self._configFile = path
+            self._configFile.seek(0)
+            if hasattr(self._configParser, 'read_file'):
+                self._configParser.read_file(self._configFile)
+            else:
+                self._configParser.readfp(self._configFile)  # pylint: disable=deprecated-method
+        else:
+            self.path = os.path.abspath(path)
+            self._configParser.read(self.path)
+        self._clientClasses = _findClientClasses()
+        self._clientCache = {}
 
     def getClient(self, clientId):
         """
         Return a client object which represents the client
         with the given client id.
         :raises KeyError: If no client with the given client id exists.
+        :raises NoOptionError: If the client is missing a required option.
         :param clientId: The id of the client.
         :return: A client object.
         """
+        cacheKey = clientId
+        try:
+            return _createClient(*self._clientCache[cacheKey])
+        except KeyError:
+            pass
         sectionName = 'client_' + clientId
         if not isinstance(sectionName, str):  # clientId is unicode
             sectionName = sectionName.encode('utf-8')
             clientId = clientId.encode('utf-8')
         if not self._configParser.has_section(sectionName):
             raise KeyError('No client with id "{id}" exists'.format(id=clientId))
-        clientType = self._configParser.get(sectionName, 'type')
+        kwargs = dict(self._configParser.items(sectionName))
+        try:
+            clientType = kwargs.pop('type')
+            redirectUris = kwargs.pop('redirect_uris').split()
+            authorizedGrantTypes = kwargs.pop('authorized_grant_types').split()
+        except KeyError as error:
+            # Don't let a malformed section look like an unknown client.
+            raise NoOptionError(error.args[0], sectionName)
         for cls in self._clientClasses:
             if cls.__name__ == clientType:
                 clientClass = cls
                 break
         else:
             raise ValueError('Unable to find client class ' + clientType)
-        redirectUris = self._configParser.get(sectionName, 'redirect_uris').split()
-        authorizedGrantTypes = self._configParser.get(sectionName, 'authorized_grant_types').split()
-        kwargs = {key: value for key, value in self._configParser.items(sectionName)
-                  if key not in ['type', 'redirect_uris', 'authorized_grant_types']}
-        return clientClass(clientId, redirectUris, authorizedGrantTypes, **kwargs)
+        clientArgs = clientClass, clientId, redirectUris, authorizedGrantTypes, kwargs
+        self._clientCache[cacheKey] = clientArgs
+        return _createClient(*clientArgs)
 
     def addClient(self, client):
         """
         Add a new or update an existing client to the list
-        and save it to the config file.
+        and save it to the config file, if autoSave is enabled.
         :raises ValueError: If the data in the client is not valid.
         :param client: The client to update or add.
         """
         sectionName = 'client_' + client.id
-        if not self._configParser.has_section(sectionName):
-            self._configParser.add_section(sectionName)
-        self._configParser.set(sectionName, 'type', client.__class__.__name__)
-        self._configParser.set(sectionName, 'redirect_uris', ' '.join(client.redirectUris))
-        self._configParser.set(sectionName, 'authorized_grant_types',
-                               ' '.join(client.authorizedGrantTypes))
+        options = {
+            'type': client.__class__.__name__,
+            'redirect_uris': ' '.join(client.redirectUris),
+            'authorized_grant_types': ' '.join(client.authorizedGrantTypes),
+        }
         for name, value in client.__dict__.items():
             if name not in ['id', 'redirectUris', 'authorizedGrantTypes']:
-                self._configParser.set(sectionName, name, value)
+                options[self._configParser.optionxform(name)] = value
+        self._clientCache.pop(client.id, None)
+        if self._configParser.has_section(sectionName):
+            if dict(self._configParser.items(sectionName)) == options:
+                # The client is already stored unchanged, so only a previously
+                # failed write of the client is left to be retried.
+                if self.autoSave:
+                    self.save()
+                return
+        else:
+            self._configParser.add_section(sectionName)
+        for name, value in options.items():
+            self._configParser.set(sectionName, name, value)
+        self._dirty = True
+        if self.autoSave:
+            self.save()
+
+    def save(self):
+        """ Write the clients to the config file, if they changed since the last write. """
+        if not self._dirty:
+            return
+        # Serialize the whole config up front, so it can be written with a single call.
+        content = StringIO()
+        self._configParser.write(content)
+        content = content.getvalue()
+        if self._configFile is not None:
+            self._configFile.seek(0)
+            self._configFile.truncate()
+            self._configFile.write(content)
+        else:
+            if not self._directoryCreated:
+                try:
+                    os.makedirs(os.path.dirname(self.path))
+                except OSError:
+                    pass
+                self._directoryCreated = True
+            with open(self.path, 'w') as configFile:
+                configFile.write(content)
+        self._dirty = False
+
+
+class SQLiteClientStorage(ClientStorage):
+    """ A ClientStorage using a sqlite database. """
+    _CREATE_TABLE = 'CREATE TABLE IF NOT EXISTS clients (' \
+                    'client_id TEXT PRIMARY KEY, type TEXT NOT NULL, ' \
+                    'redirect_uris TEXT NOT NULL, authorized_grant_types TEXT NOT NULL, ' \
+                    'options TEXT NOT NULL)'
+    _SELECT_CLIENT = 'SELECT type, redirect_uris, authorized_grant_types, options ' \
+                     'FROM clients WHERE client_id = ?'
+    _INSERT_CLIENT = 'INSERT OR REPLACE INTO clients (client_id, type, redirect_uris, ' \
+                     'authorized_grant_types, options) VALUES (?, ?, ?, ?, ?)'
+    path = None
+
+    def __init__(self, path):
+        """
+        Initialize a new SQLiteClientStorage which loads and stores
+        it's clients in the sqlite database at the given path.
+        :param path: Path to the database file or ':memory:' for an in-memory database.
+        """
+        super(SQLiteClientStorage, self).__init__()
+        # The sqlite3 module is optional in some Python builds,
+        # so it is only required when this storage is used.
+        import sqlite3  # pylint: disable=import-outside-toplevel
+        if path != ':memory:':
+            path = os.path.abspath(path)
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError:
+                pass
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        self._connection.text_factory = str
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        with self._connection:
+            self._connection.execute(self._CREATE_TABLE)
+        self._clientClasses = _findClientClasses()
+        self._clientCache = {}
+
+    def getClient(self, clientId):
+        """
+        Return a client object which represents the client
+        with the given client id.
+        :raises KeyError: If no client with the given client id exists.
+        :param clientId: The id of the client.
+        :return: A client object.
+        """
+        cacheKey = clientId
         try:
-            os.makedirs(os.path.dirname(self.path))
-        except OSError:
+            return _createClient(*self._clientCache[cacheKey])
+        except KeyError:
             pass
-        with open(self.path, 'w') as configFile:
-            self._configParser.write(configFile)
+        if not isinstance(clientId, str):  # clientId is unicode
+            clientId = clientId.encode('utf-8')
+        row = self._connection.execute(self._SELECT_CLIENT, (clientId,)).fetchone()
+        if row is None:
+            raise KeyError('No client with id "{id}" exists'.format(id=clientId))
+        clientType, redirectUris, authorizedGrantTypes, options = row
+        for cls in self._clientClasses:
+            if cls.__name__ == clientType:
+                clientClass = cls
+                break
+        else:
+            raise ValueError('Unable to find client class ' + clientType)
+        kwargs = {str(key): value for key, value in json.loads(options).items()}
+        clientArgs = (clientClass, clientId, redirectUris.split(), authorizedGrantTypes.split(),
+                      kwargs)
+        self._clientCache[cacheKey] = clientArgs
+        return _createClient(*clientArgs)
 
-    @staticmethod
-    def _findClientClasses():
-        classes = set()
-        newClasses = {Client}
-        while len(newClasses) != 0:
-            newClasses = {subclass for cls in newClasses for subclass in cls.__subclasses__()}
-            newClasses -= classes
-            classes |= newClasses
-        return classes
+    def addClient(self, client):
+        """
+        Add a new or update an existing client in the database.
+        :raises ValueError: If the data in the client is not valid.
+        :param client: The client to update or add.
+        """
+        options = {name: value for name, value in client.__dict__.items()
+                   if name not in ['id', 'redirectUris', 'authorizedGrantTypes']}
+        try:
+            options = json.dumps(options, sort_keys=True)
+        except TypeError:
+            raise ValueError('The attributes of the client can not be stored as json')
+        self._clientCache.pop(client.id, None)
+        with self._connection:
+            self._connection.execute(self._INSERT_CLIENT, (
+                client.id, client.__class__.__name__, ' '.join(client.redirectUris),
+                ' '.join(client.authorizedGrantTypes), options))
+
+    def close(self):
+        """ Close the connection to the database. """
+        self._connection.close()
+
+
+class _TokenEntry(object):
+    """ The data that the DictTokenStorage stores for a token. """
+    __slots__ = ('data', 'birthTime', 'expireTime', 'scope', 'scopeSet', 'client')
+
+    def __init__(self, data, birthTime, expireTime, scope, client):
+        self.data = data
+        self.birthTime = birthTime
+        self.expireTime = expireTime
+        self.scope = scope
+        self.scopeSet = frozenset(scope)
+        self.client = client
 
 
 class DictTokenStorage(TokenStorage):
@@ -114,69 +327,153 @@ class DictTokenStorage(TokenStorage):
     This token storage does not implement any type of persistence and tokens will therefore
     not survive a server restart. This implementation should probably only be used for testing.
     """
-    _tokens = {}
+    # Scopes of these types are treated as a collection of scopes instead of a single scope.
+    _SCOPE_COLLECTION_TYPES = (list, tuple, set, frozenset)
+
+    def __init__(self):
+        super(DictTokenStorage, self).__init__()
+        self._tokens = {}
+        self._clientTokens = {}
+        self._expireTimes = []
+        self._numStaleExpireTimes = 0
 
     def contains(self, token):
-        if token not in self._tokens:
-            return False
-        return not self._checkExpire(token)
+        entry = self._tokens.get(token)
+        return entry is not None and not self._checkExpire(entry)
 
     def hasAccess(self, token, scope):
-        if self._checkExpire(token):
-            raise KeyError('Token expired')
-        if not isinstance(scope, list):
+        entry = self._getEntry(token)
+        if not isinstance(scope, self._SCOPE_COLLECTION_TYPES):
             scope = [scope]
-        for scopeItem in scope:
-            if scopeItem not in self._tokens[token]['scope']:
-                return False
-        return True
+        return entry.scopeSet.issuperset(scope)
 
     def getTokenAdditionalData(self, token):
-        self._checkExpire(token)
-        return self._tokens[token]['data']
+        return self._getEntry(token).data
 
     def getTokenScope(self, token):
-        self._checkExpire(token)
-        return self._tokens[token]['scope']
+        return self._getEntry(token).scope
 
     def getTokenClient(self, token):
-        self._checkExpire(token)
-        return self._tokens[token]['client']
+        return self._getEntry(token).client
 
     def getTokenLifetime(self, token):
-        self._checkExpire(token)
-        return int(time.time()) - self._tokens[token]['birthTime']
+        now = time.time()
+        return int(now) - self._getEntry(token, now).birthTime
 
     def store(self, token, client, scope, additionalData=None, expireTime=None):
         if not isinstance(token, str):
             raise ValueError('Token parameter is not a string')
         if not isinstance(scope, list):
-            scope = [scope]
+            scope = list(scope) if isinstance(scope, self._SCOPE_COLLECTION_TYPES) else [scope]
         if expireTime is not None and expireTime <= time.time():
             return
-        self._tokens[token] = {
-            'data': additionalData,
-            'birthTime': int(time.time()),
-            'expireTime': expireTime,
-            'scope': scope,
-            'client': client.id
-        }
+        if token in self._tokens:
+            self._removeToken(token)
+        self._tokens[token] = _TokenEntry(
+            additionalData, int(time.time()), expireTime, scope, client.id)
+        self._clientTokens.setdefault(client.id, set()).add(token)
+        if expireTime is not None:
+            heapq.heappush(self._expireTimes, (expireTime, token))
 
     def remove(self, token):
-        del self._tokens[token]
+        self._removeToken(token)
+
+    def clear(self):
+        """ Remove all tokens from the token storage. """
+        self._tokens.clear()
+        self._clientTokens.clear()
+        del self._expireTimes[:]
+        self._numStaleExpireTimes = 0
 
-    def _checkExpire(self, token):
+    def getTokensForClient(self, clientId):
         """
-        Check if a token has expired and remove it if necessary.
+        :param clientId: The id of a client.
+        :return: A list of all tokens in this token storage that were stored for the client.
+        """
+        now = time.time()
+        tokens = []
+        for token in list(self._clientTokens.get(clientId, ())):
+            entry = self._tokens.get(token)
+            if entry is not None and not self._checkExpire(entry, now):
+                tokens.append(token)
+        return tokens
+
+    def purgeExpired(self):
+        """ Remove all expired tokens from the token storage. """
+        now = time.time()
+        # The head of the heap always belongs to a stored token, see _discardStaleExpireTimes.
+        while len(self._expireTimes) != 0 and self._expireTimes[0][0] < now:
+            self._removeToken(self._expireTimes[0][1])
+
+    def _removeToken(self, token):
+        """
+        Remove a token from the token storage and from the index of its client.
         :raises KeyError: If the token is not in the token storage.
-        :param token: The token to check.
+        :param token: The token to remove.
+        """
+        entry = self._tokens.pop(token)
+        clientTokens = self._clientTokens[entry.client]
+        clientTokens.discard(token)
+        if len(clientTokens) == 0:
+            del self._clientTokens[entry.client]
+        if entry.expireTime is not None:
+            self._numStaleExpireTimes += 1
+            self._discardStaleExpireTimes()
+
+    def _discardStaleExpireTimes(self):
+        """
+        Remove the expire times of tokens that are no longer stored from the heap.
+        Stale entries are popped as soon as they reach the head of the heap and the
+        heap is rebuilt once at least half of its entries are stale, so it can't grow
+        beyond twice the number of stored tokens that can expire.
+        """
+        expireTimes = self._expireTimes
+        while len(expireTimes) != 0:
+            expireTime, token = expireTimes[0]
+            entry = self._tokens.get(token)
+            # The token might have been removed or stored again with another expire time.
+            if entry is not None and entry.expireTime == expireTime:
+                break
+            heapq.heappop(expireTimes)
+            self._numStaleExpireTimes -= 1
+        if self._numStaleExpireTimes * 2 > len(expireTimes):
+            self._expireTimes = [(entry.expireTime, token) for token, entry in self._tokens.items()
+                                 if entry.expireTime is not None]
+            heapq.heapify(self._expireTimes)
+            self._numStaleExpireTimes = 0
+
+    def _getEntry(self, token, now=None):
+        """
+        :raises KeyError: If the token is not in the token storage or has expired.
+        :param token: A token.
+        :param now: The current time in seconds since the epoch or None to query it.
+        :return: The stored entry of the token.
+        """
+        entry = self._tokens[token]
+        if self._checkExpire(entry, now):
+            raise KeyError('Token expired')
+        return entry
+
+    def _checkExpire(self, entry, now=None):
+        """
+        Check if a token has expired and remove all expired tokens if necessary.
+        :param entry: The stored entry of the token.
+        :param now: The current time in seconds since the epoch or None to query it.
+                    Callers that check multiple tokens can pass the same time to all checks.
         :return: True if the token has expired.
         """
-        expireTime = self._tokens[token]['expireTime']
-        if expireTime is not None and time.time() > expireTime:
-            del self._tokens[token]
-            return True
-        return False
+        if len(self._expireTimes) == 0:
+            return False
+        if now is None:
+            now = time.time()
+        # The heap contains the expire times of all tokens that can expire,
+        # so its smallest entry is a lower bound for every expire time in the storage.
+        if now <= self._expireTimes[0][0]:
+            return False
+        # Remove all expired tokens, so the head of the heap is valid for the next checks.
+        while len(self._expireTimes) != 0 and now > self._expireTimes[0][0]:
+            self._removeToken(self._expireTimes[0][1])
+        return entry.expireTime is not None and now > entry.expireTime
 
 
 class DictNonPersistentStorage(PersistentStorage):
@@ -2,6 +2,7 @@
 # See LICENSE for details.
 """ The token endpoint. """
 import logging
+import re
 import string
 import time
 import json
@@ -217,6 +218,8 @@ class TokenResource(Resource, object):
        3. This resource creates and stores another access token and returns it.
     """
     VALID_TOKEN_CHARS = string.digits + string.ascii_letters + '-._~+/'
+    # The compiled token patterns, keyed by the VALID_TOKEN_CHARS they were compiled from.
+    _VALID_TOKEN_PATTERNS = {}
     tokenFactory = None
     persistentStorage = None
     allowInsecureRequestDebug = False
@@ -647,7 +650,11 @@ class TokenResource(Resource, object):
         :param token: The token to check.
         :return: True, if the token conforms to the specification, False otherwise
         """
-        return all(char in cls.VALID_TOKEN_CHARS for char in token)
+        pattern = cls._VALID_TOKEN_PATTERNS.get(cls.VALID_TOKEN_CHARS)
+        if pattern is None:
+            pattern = re.compile('[' + re.escape(cls.VALID_TOKEN_CHARS) + ']*\\Z')
+            cls._VALID_TOKEN_PATTERNS[cls.VALID_TOKEN_CHARS] = pattern
+        return pattern.match(token) is not None
 
     @staticmethod
     def getTokenStorageSingleton():
@@ -2,6 +2,8 @@
 # See LICENSE for details.
 """ Utility methods. """
 
+from hmac import compare_digest
+
 try:
     from __builtin__ import basestring as StringType, long as LongType
 except ImportError:
@@ -31,6 +33,22 @@ def isIntType(val):
     return isinstance(val, (int, LongType))
 
 
+def secretEquals(secret, expectedSecret):
+    """
+    Compare two secrets in a time that does not depend on how much of them matches.
+    :param secret: The secret to check.
+    :param expectedSecret: The secret to compare against.
+    :return: True, if both secrets are strings or byte strings and are equal.
+    """
+    if isAnyStr(secret) and not isinstance(secret, bytes):
+        secret = secret.encode('utf-8')
+    if isAnyStr(expectedSecret) and not isinstance(expectedSecret, bytes):
+        expectedSecret = expectedSecret.encode('utf-8')
+    if not isinstance(secret, bytes) or not isinstance(expectedSecret, bytes):
+        return False
+    return compare_digest(secret, expectedSecret)
+
+
 def addToUrl(url, query=None, fragment=None):
     """
     Add the query and or fragment to the url, preserving an existing query